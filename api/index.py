@@ -1,9 +1,9 @@
 import os
 import sys
-import asyncio
 import time
 
-from flask import Flask, jsonify
+import orjson
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from bson import json_util
 from bson.objectid import ObjectId
@@ -28,6 +28,8 @@ Scraper = ScraperModule.Scraper
 analyse_sentiment = SentimentModule.analyse_sentiment
 lsa_summarize = SummarizerModule.lsa_summarize
 
+__all__ = ['app']
+
 app = Flask(__name__)
 CORS(app) # Enable CORS for all routes
 
@@ -52,7 +54,9 @@ if not MONGODB_URI or "<db_password>" in MONGODB_URI:
         MONGODB_URI = "mongodb://localhost:27017/news_scraper"
 
 try:
-    client = MongoClient(MONGODB_URI)
+    # Module-level client so warm invocations reuse its connection pool
+    client = MongoClient(MONGODB_URI, maxPoolSize=50, minPoolSize=5,
+                         serverSelectionTimeoutMS=3000)
     # Health check to catch auth errors early
     client.admin.command('ping')
     db = client['news_database']
@@ -62,10 +66,50 @@ except Exception as e:
     db = None
     collection = None
 
+# Indexes only need creating once per cold start; MongoDB no-ops existing ones
+if collection is not None:
+    try:
+        # Backs the {'tag': {'$in': ...}} queries of the tag routes
+        collection.create_index('tag')
+        # Lets each scraped article's upsert match on name via an index seek
+        collection.create_index('name', unique=True)
+    except Exception as e:
+        app.logger.warning(f"Failed to create indexes: {e}")
+
 # Links to be scraped
 URL = 'https://www.thestar.com.my'
 URL_WITH_TAG = 'https://www.thestar.com.my/news/latest?tag='
 
+# Number of articles returned by the listing routes unless ?limit= is given
+DEFAULT_NEWS_LIMIT = 100
+# Upper bound on ?limit= so a request can't pull the whole collection
+MAX_NEWS_LIMIT = 1000
+
+def fetch_latest_news(query=None):
+    """
+    Returns the most recent matching articles, oldest first as the dashboard expects.
+    """
+    limit = request.args.get('limit', default=DEFAULT_NEWS_LIMIT, type=int)
+    # pymongo treats 0 as no limit and negative values as a single batch
+    if limit <= 0:
+        limit = DEFAULT_NEWS_LIMIT
+    limit = min(limit, MAX_NEWS_LIMIT)
+    cursor = collection.find(query or {}).sort('_id', -1).limit(limit)
+    return list(reversed(list(cursor)))
+
+def build_upsert(data):
+    """
+    Upserts a scraped article by name; url and category only change on insert.
+    """
+    return UpdateOne({"name": data['name']},
+                     {"$set": {"content": data['content'],
+                               "published_date": data['published_date'],
+                               "tag": data['tag'],
+                               "weighted_sum": data['weighted_sum']},
+                      "$setOnInsert": {"url": data['url'],
+                                       "category": data['category']}},
+                     upsert=True)
+
 # Handle routing 
 @app.route('/api/scrape')
 def server_scrape_news():
@@ -80,9 +124,8 @@ def server_scrape_news():
         if collection is None:
             logger.error("Database connection not established. Scraped data will not be saved.")
         elif news_scraper.articlesDetails:
-            bulk_operations = [UpdateOne({"name": data['name']}, {"$set": data}, upsert=True)
-                               for data in news_scraper.articlesDetails]
-            collection.bulk_write(bulk_operations)
+            bulk_operations = [build_upsert(data) for data in news_scraper.articlesDetails]
+            collection.bulk_write(bulk_operations, ordered=False, bypass_document_validation=True)
     except Exception as e:
         logger.error(f"Error updating database: {e}")
     finally:
@@ -92,13 +135,13 @@ def server_scrape_news():
     app.last_scraped = news_scraper.articlesDetails
         
     if collection is not None:
-        result = list(collection.find())
+        result = fetch_latest_news()
     else:
         result = news_scraper.articlesDetails
     end = time.time()
     logger.info(f"Total time: {end - start:.4f} seconds")
     return app.response_class(
-        response=json_util.dumps(result),
+        response=orjson.dumps(result, default=json_util.default, option=orjson.OPT_NON_STR_KEYS),
         status=200,
         mimetype='application/json'
     )
@@ -109,9 +152,9 @@ def server_fetch_news():
     if collection is None:
         return jsonify({"error": "Database connection not established"}), 503
     try:
-        result = list(collection.find())
+        result = fetch_latest_news()
         return app.response_class(
-            response=json_util.dumps(result),
+            response=orjson.dumps(result, default=json_util.default, option=orjson.OPT_NON_STR_KEYS),
             status=200,
             mimetype='application/json'
         )
@@ -139,7 +182,12 @@ def sentiment_analysis_route(news_id):
         # Try finding by ObjectId
         if len(news_id) == 24: # Typical ObjectId hex length
             try:
-                target = collection.find_one({"_id": ObjectId(news_id)})
+                # Articles are scored while scraping, so the content isn't needed here
+                target = collection.find_one({"_id": ObjectId(news_id)},
+                                             projection={"name": 1, "weighted_sum": 1})
+                if target and target.get('weighted_sum') is None:
+                    # Stored before scores were precomputed; score its content instead
+                    target = collection.find_one({"_id": ObjectId(news_id)})
             except:
                 pass
         
@@ -161,7 +209,7 @@ def sentiment_analysis_route(news_id):
             return jsonify({"error": "News not found in database. Try scraping again."}), 404
             
         logger.info(f"Found news item: {target.get('name', 'Unknown')}")
-        result = asyncio.run(analyse_sentiment(target))
+        result = analyse_sentiment(target)
         logger.info(f"Sentiment result: {result}")
         return jsonify(result)
     except Exception as e:
@@ -198,7 +246,7 @@ def summarize_route(news_id):
             return jsonify({"error": "News not found..."}), 404
             
         logger.info(f"Found news item for summary: {target.get('name', 'Unknown')}")
-        result = asyncio.run(lsa_summarize(target))
+        result = lsa_summarize(target)
         if not result:
             logger.warning("Summary returned empty string.")
         return result
@@ -217,21 +265,20 @@ def get_scraped_data_by_tag(tags):
     try: 
         logger.info("(Server) Update database with scraped data...")
         if news_scraper.articlesDetails:
-            bulk_operations = [UpdateOne({"name": data['name']}, {"$set": data}, upsert=True)
-                               for data in news_scraper.articlesDetails]
-            collection.bulk_write(bulk_operations)
+            bulk_operations = [build_upsert(data) for data in news_scraper.articlesDetails]
+            collection.bulk_write(bulk_operations, ordered=False, bypass_document_validation=True)
     except Exception as e:
         logger.error(f"Error updating database: {e}")
     finally:
         logger.info("(Server) Scraping process completed")
         
     if collection is not None:
-        result = list(collection.find({'tag': {'$in': tag_list}})) 
+        result = fetch_latest_news({'tag': {'$in': tag_list}})
     else:
         result = [a for a in news_scraper.articlesDetails if a.get('tag') in tag_list]
         
     return app.response_class(
-        response=json_util.dumps(result),
+        response=orjson.dumps(result, default=json_util.default, option=orjson.OPT_NON_STR_KEYS),
         status=200,
         mimetype='application/json'
     )
@@ -242,9 +289,9 @@ def fetch_news_with_tag(tags):
     if collection is None:
         return jsonify({"error": "Database connection not established"}), 503
     tag_list = tags.split('&')
-    news_data = list(collection.find({'tag': {'$in': tag_list}})) 
+    news_data = fetch_latest_news({'tag': {'$in': tag_list}})
     return app.response_class(
-        response=json_util.dumps(news_data),
+        response=orjson.dumps(news_data, default=json_util.default, option=orjson.OPT_NON_STR_KEYS),
         status=200,
         mimetype='application/json'
     )
@@ -1,19 +1,58 @@
+import re
 import time
 import logging
+import threading
 import requests
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sentiment_analysis import score_sentences
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+__all__ = ['Scraper']
+
+# Shared HTTP session so pooled keep-alive connections persist across scrapes
+# (and across warm invocations) instead of a new TCP+TLS handshake per article
+http_session = requests.Session()
+adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                      max_retries=Retry(total=2, backoff_factor=0.2))
+http_session.mount('http://', adapter)
+http_session.mount('https://', adapter)
+
+# Recently scraped (and scored) article details keyed by URL, so repeated scrapes
+# skip fetching, parsing and scoring unchanged articles
+_DETAILS_CACHE = TTLCache(maxsize=512, ttl=300)
+_DETAILS_CACHE_LOCK = threading.Lock()
+
+def _classes(attrs):
+    # While parsing, the class attribute is still the raw space-separated string
+    return set((attrs.get('class') or '').split())
+
+# Only build the parts of listing pages the scraper actually reads
+LIST_STRAINER = SoupStrainer(
+    lambda name, attrs: name == 'div' and not _classes(attrs).isdisjoint(
+        ('in-sec-story', 'focus-story', 'more-story', 'timeline-content')))
+
 class Scraper:
+    # Captures the path of a /news/<subcategory>/... link on the site, without its
+    # fragment or query, and rejects the categories we don't scrape
+    URL_RE = re.compile(r'^(?:https?://www\.thestar\.com\.my)?'
+                        r'(/news/(?!(?i:lifestyle|food|tech|travel|business|entertainment|culture)/)[^#?]+)')
+
     def __init__(self, url, urlWithTag, tags=[]):
         self.articles = []
         self.articlesDetails = []
         self.url = url
         self.urlWithTag = urlWithTag
         self.tags = tags
+        # Sessions are safe to share between worker threads for plain GETs
+        self.session = http_session
 
     def setup_driver(self):
         # No-op now as we don't use Selenium, but kept for compatibility with existing server calls
@@ -24,9 +63,9 @@ class Scraper:
         Retrieves a list of articles with their name and urls to be scraped.
         """
         try:
-            response = requests.get(self.url, timeout=10)
+            response = self.session.get(self.url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=LIST_STRAINER)
             
             # Select articles based on clearer news-specific classes
             # Only picking from sections likely to contain main news
@@ -36,9 +75,6 @@ class Scraper:
             self.articles = []
             seen_hrefs = set()
             
-            # Categories to exclude
-            exclude_list = ['/lifestyle/', '/food/', '/tech/', '/travel/', '/business/', '/entertainment/', '/culture/']
-            
             for a in found_articles:
                 text = a.get_text(strip=True)
                 href = a.get('href')
@@ -47,21 +83,19 @@ class Scraper:
                 if not href or not text or len(text) < 15: # Longer titles usually mean news
                     continue
                     
-                if not href.startswith('http'):
-                    href = 'https://www.thestar.com.my' + href
-                
-                # Clean up URL (remove fragments/queries)
-                href = href.split('#')[0].split('?')[0]
+                # Filter: must be on the domain, contain /news/ followed by a subcategory
+                # and NOT be an excluded category
+                match = self.URL_RE.match(href)
+                if not match:
+                    continue
+                href = 'https://www.thestar.com.my' + match.group(1)
                 
-                # Avoid duplicates and check for valid news structure
+                # Avoid duplicates
                 if href in seen_hrefs:
                     continue
                 
-                # Filter: must start with domain, contain /news/ followed by a subcategory
-                # and NOT contain excluded categories
-                if (href.startswith('https://www.thestar.com.my/news/') and 
-                    text.upper() != text and
-                    not any(x in href.lower() for x in exclude_list)):
+                # All-caps link text is section navigation rather than a headline
+                if text.upper() != text:
                     
                     # Further check: news articles usually have a date-like structure in URL or certain depth
                     # e.g., /news/nation/2026/02/16/...
@@ -78,9 +112,9 @@ class Scraper:
         for tag in self.tags:
             target_url = self.urlWithTag + tag
             try:
-                response = requests.get(target_url, timeout=10)
+                response = self.session.get(target_url, timeout=10)
                 response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml', parse_only=LIST_STRAINER)
                 
                 # Original XPath: //div[contains(@class, 'timeline-content')]//h2//a
                 found_articles = soup.select('div.timeline-content h2 a')
@@ -97,42 +131,42 @@ class Scraper:
 
     def get_articles_details(self, article):
         """
-        Handles the request of each articles.
+        Handles the request of each articles and returns its scraped details.
         """
-        try: 
-            req = requests.get(article[1], timeout=10)
-            req.raise_for_status()
-            soup = BeautifulSoup(req.text, 'lxml')
-            result = self.scrape_details(soup, article[0], article[1], article[2])
-            self.articlesDetails.append(result)
-        except Exception as error:
-            logger.error(f"Error encountered while requesting for article {article[1]}: {error}")
+        with _DETAILS_CACHE_LOCK:
+            cached = _DETAILS_CACHE.get(article[1])
+        if cached is not None:
+            # The same URL can be listed under another title or tag
+            return dict(cached, name=article[0], tag=article[2])
+        req = self.session.get(article[1], timeout=10)
+        req.raise_for_status()
+        # Lexbor decodes raw bytes as UTF-8 without reading the meta charset; the site serves UTF-8
+        return self.scrape_details(req.content, article[0], article[1], article[2])
 
-    def scrape_details(self, soup, name, url, tag):
+    def scrape_details(self, html, name, url, tag):
         """
-        Extracts data from BeautifulSoup object
+        Extracts data from the article's HTML using selectolax's lexbor parser
         """
+        tree = LexborHTMLParser(html)
         data = {}
         data['name'] = name
         data['url'] = url
         
-        kicker = soup.find('a', class_='kicker')
-        data['category'] = kicker.text if kicker else "Unknown"
+        kicker = tree.css_first('a.kicker')
+        data['category'] = kicker.text() if kicker else "Unknown"
         
-        date_elem = soup.find(class_='date')
-        data['published_date'] = str(date_elem.text).strip() if date_elem else "Unknown"
+        date_elem = tree.css_first('.date')
+        data['published_date'] = date_elem.text().strip() if date_elem else "Unknown"
         
-        story_body = soup.find(id='story-body')
+        story_body = tree.css_first('#story-body')
         if story_body:
             # More robust paragraph extraction, filtering out ads and navigational text
-            paragraphs = []
-            for p in story_body.find_all("p"):
-                text = p.get_text(strip=True)
-                # Skip short sentences or common ad/navigation strings
-                if text and len(text) > 10:
-                    lower_text = text.lower()
-                    if not any(x in lower_text for x in ["advertisement", "subscribe", "read also", "related story", "watching:"]):
-                        paragraphs.append(text)
+            ad_markers = ("advertisement", "subscribe", "read also", "related story", "watching:")
+            # Collapse whitespace without adding any at inline-tag boundaries
+            texts = [' '.join(p.text().split()) for p in story_body.css("p")]
+            # Skip short sentences or common ad/navigation strings
+            paragraphs = [text for text, lower_text in ((t, t.lower()) for t in texts)
+                          if len(text) > 10 and not any(x in lower_text for x in ad_markers)]
             data['content'] = ' '.join(paragraphs)
         else:
             data['content'] = ""
@@ -140,14 +174,39 @@ class Scraper:
         data['tag'] = tag
         return data
 
+    def score_details(self, data):
+        """
+        Scores the sentiment of scraped details so the analysis route doesn't re-read the content
+        """
+        try:
+            data['weighted_sum'] = float(score_sentences(data['content']).sum())
+        except Exception as error:
+            # Keep the article; the sentiment route rescores content when weighted_sum is None
+            logger.error(f"Error scoring sentiment for article {data['url']}: {error}")
+            data['weighted_sum'] = None
+
     def thread_scrape_details(self):
         """
         Utilizes multiple threads to speed up scraping process of each article.
         """
         # Filter out empty articles or invalid entries
         valid_articles = [a for a in self.articles if a[1]]
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            executor.map(self.get_articles_details, valid_articles)
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            futures = {executor.submit(self.get_articles_details, article): article
+                       for article in valid_articles}
+            # Collect and score in the calling thread as each article finishes, keeping
+            # the CPU-bound VADER work out of the I/O pool while other fetches continue
+            for future in as_completed(futures):
+                try:
+                    data = future.result()
+                except Exception as error:
+                    logger.error(f"Error encountered while requesting for article {futures[future][1]}: {error}")
+                    continue
+                if 'weighted_sum' not in data:
+                    self.score_details(data)
+                    with _DETAILS_CACHE_LOCK:
+                        _DETAILS_CACHE[data['url']] = dict(data)
+                self.articlesDetails.append(data)
 
     def tear_down(self):
         # No-op now as we don't use Selenium
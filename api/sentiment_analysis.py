@@ -1,5 +1,9 @@
+import re
+import functools
+
 import nltk
-import asyncio
+import numpy as np
+from nltk.tokenize import sent_tokenize
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
 # Ensure necessary data is downloaded to a writable location
@@ -12,37 +16,44 @@ def setup_nltk():
     except LookupError:
         nltk.download('vader_lexicon', download_dir=nltk_data_path)
     try:
-        nltk.data.find('tokenizers/punkt.zip')
+        nltk.data.find('tokenizers/punkt')
     except LookupError:
         nltk.download('punkt', download_dir=nltk_data_path)
+    # NLTK >= 3.8.2 loads the punkt model from punkt_tab instead; older versions never read it
+    if tuple(int(x) for x in re.findall(r'\d+', nltk.__version__)[:3]) >= (3, 8, 2):
+        try:
+            nltk.data.find('tokenizers/punkt_tab')
+        except LookupError:
+            nltk.download('punkt_tab', download_dir=nltk_data_path)
 
 setup_nltk()
-sid = SentimentIntensityAnalyzer()
 
-async def classify(data):
-    sentiment_scores = sid.polarity_scores(data)
-    
-    return [{'label': 'POSITIVE' if sentiment_scores['compound'] >= 0 else 'NEGATIVE',
-             'score': sentiment_scores['compound']}]
+# Loaded once per process so warm invocations skip re-parsing the VADER lexicon
+@functools.lru_cache(maxsize=1)
+def get_sid():
+    return SentimentIntensityAnalyzer()
+
+def score_sentences(text):
+    """
+    Returns the VADER compound score of every sentence in text as a float64 array.
+    """
+    sid = get_sid()
+    sentences = sent_tokenize(text)
+    return np.fromiter((sid.polarity_scores(sentence)['compound'] for sentence in sentences),
+                       dtype=np.float64, count=len(sentences))
 
-async def analyse_sentiment(data):
-    if not data.get('content'):
+def analyse_sentiment(data):
+    if data.get('weighted_sum') is not None:
+        # Already scored by the scraper
+        weighted_sum = data['weighted_sum']
+    elif not data.get('content'):
         return {
             'weighted_sum': 0,
             'overall_sentiment': 'NEUTRAL'
         }
-        
-    paragraphs = [classify(sentence)
-                  for sentence in data['content'].split(". ")]
-    
-    sentiment_result = await asyncio.gather(*paragraphs)
-    sentiment_flattened = [sentiment for sentiment_list in sentiment_result
-                                    for sentiment in sentiment_list]
-    
-    labels = [sentiment['label'] for sentiment in sentiment_flattened]
-    scores = [sentiment['score'] for sentiment in sentiment_flattened]
-
-    weighted_sum = sum(scores)
+    else:
+        # VADER is pure CPU work, so score every sentence in one synchronous pass
+        weighted_sum = float(score_sentences(data['content']).sum())
 
     overall_sentiment = ''
     if weighted_sum == 0:
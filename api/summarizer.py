@@ -1,5 +1,5 @@
+import re
 import math
-import asyncio
 import nltk
 
 from sumy.nlp.stemmers import Stemmer
@@ -14,9 +14,15 @@ def setup_nltk():
     if nltk_data_path not in nltk.data.path:
         nltk.data.path.append(nltk_data_path)
     try:
-        nltk.data.find('tokenizers/punkt.zip')
+        nltk.data.find('tokenizers/punkt')
     except LookupError:
         nltk.download('punkt', download_dir=nltk_data_path)
+    # NLTK >= 3.8.2 loads the punkt model from punkt_tab instead; older versions never read it
+    if tuple(int(x) for x in re.findall(r'\d+', nltk.__version__)[:3]) >= (3, 8, 2):
+        try:
+            nltk.data.find('tokenizers/punkt_tab')
+        except LookupError:
+            nltk.download('punkt_tab', download_dir=nltk_data_path)
 
 setup_nltk()
 
@@ -28,14 +34,14 @@ def parse_and_summarize(target, language):
     return parser, summarizer
 
 # Main function
-async def lsa_summarize(data, percentage=0.1, language='english'):
+def lsa_summarize(data, percentage=0.1, language='english'):
     target = data.get('content', '')
     if not target:
         return ""
         
     # Find the maximum number of sentences to be generated
     max_length = math.ceil(len(target.split(". ")) * percentage)
-    parser, summarizer = await asyncio.to_thread(parse_and_summarize, target, language)
+    parser, summarizer = parse_and_summarize(target, language)
     result = ""
     for sentence in summarizer(parser.document, max_length):
         result += str(sentence)